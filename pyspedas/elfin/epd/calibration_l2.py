@@ -45,23 +45,10 @@ def spec_pa_sort(
         logging.error("ELF EPD L2 PA SPECTOGRAM: pas2plot and spec2plot not same size!")
         return
     
-    if len(spec2plot.shape) == 3:
-        for i in range(spec_sectNum):
-            line = pas2plot[i, :]
-            # If the line is in descending order
-            if np.array_equal(line, np.sort(line)[::-1]):
-                # Flip the line
-                pas2plot[i, :] = line[::-1]
-                for j in range(nEngChannel):
-                    spec2plot[i, :, j] = spec2plot[i, :, j][::-1]
-    elif len(spec2plot.shape) == 2:
-        for i in range(spec_sectNum):
-            line = pas2plot[i, :]
-            # If the line is in descending order
-            if np.array_equal(line, np.sort(line)[::-1]):
-                # Flip the line
-                pas2plot[i, :] = line[::-1]
-                spec2plot[i, :] = spec2plot[i, :][::-1]
+    # flip the rows whose pitch angles are in descending order (rows containing NaNs are left as is)
+    descending = np.all(pas2plot[:, :-1] >= pas2plot[:, 1:], axis=1)
+    pas2plot[descending, :] = pas2plot[descending, ::-1]
+    spec2plot[descending, ...] = spec2plot[descending, ::-1, ...]
 
     return spec2plot, pas2plot
 
@@ -182,7 +169,7 @@ def epd_l2_Espectra(
     data = get_data(LC_tvar)
 
     # loss cone
-    paraedgedeg = np.array([lc if lc < 90 else 180-lc for lc in data.y])
+    paraedgedeg = np.where(data.y < 90, data.y, 180-data.y)
     paraedgedeg_bcast = np.broadcast_to(paraedgedeg[:, np.newaxis], (nspinsavailable, nPAsChannel))
 
     # select index 
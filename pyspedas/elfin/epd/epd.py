@@ -1,5 +1,5 @@
 import logging
-from pytplot import get_data
+from pytplot import data_quants
 import numpy as np
 
 from pyspedas.elfin.load import load
@@ -187,12 +187,16 @@ def elfin_load_epd(trange=['2022-08-19', '2022-08-19'],
         # if 32 sector data is needed, pass the variables with 32
         tvars_32 = [tvar for tvar in tvars if '_32' in tvar]
         tvars_16 = [tvar.replace('_32', '') for tvar in tvars_32]
-        tvars_other = list(set(tvars) - set(tvars_32) - set(tvars_16))
+        # keep the load order, so the postprocessing input is deterministic
+        tvars_16_set = set(tvars_16)
+        tvars_other = [tvar for tvar in tvars if '_32' not in tvar and tvar not in tvars_16_set]
         
         tvars_input = tvars_other + tvars_16
         if len(tvars_32) != 0 :
-            data = get_data(tvars_32[0])
-            if np.any(~np.isnan(data.y)) : # if any 32 sector data is not nan
+            # read the values directly rather than building the full get_data output; the 32 sector
+            # data are usually valid from the start, so check the first samples before the rest
+            data_32 = data_quants[tvars_32[0]].values
+            if np.isfinite(data_32[:1024]).any() or np.isfinite(data_32[1024:]).any(): # if any 32 sector data is not nan
                 tvars_input = tvars_other + tvars_32
         
         l2_tvars = epd_l2_postprocessing(
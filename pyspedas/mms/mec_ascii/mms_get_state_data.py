@@ -1,8 +1,13 @@
 import os
+import time
+import json
+import atexit
+import hashlib
 import logging
 import warnings
-from shutil import copyfileobj, copy
-from tempfile import NamedTemporaryFile
+import requests
+from shutil import copyfileobj
+from concurrent.futures import ThreadPoolExecutor
 from pytplot import time_double, time_string
 from pyspedas.mms.mms_login_lasp import mms_login_lasp
 from pyspedas.mms.mms_config import CONFIG
@@ -10,12 +15,151 @@ from pyspedas.mms.mec_ascii.mms_get_local_state_files import mms_get_local_state
 from pyspedas.mms.mec_ascii.mms_load_eph_tplot import mms_load_eph_tplot
 from pyspedas.mms.mec_ascii.mms_load_att_tplot import mms_load_att_tplot
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# file_info responses cached on disk are reused for this many seconds
+FILE_INFO_CACHE_TTL = 60*60.
+
+# logged-in SDC sessions, keyed by username (None for public access); these are reused
+# across calls to avoid repeating the login/TLS handshake
+_SESSION_CACHE = {}
+
+
+def _close_cached_sessions():
+    for session, user in _SESSION_CACHE.values():
+        session.close()
+    _SESSION_CACHE.clear()
+
+
+atexit.register(_close_cached_sessions)
+
+
+def _get_or_create_session(always_prompt=False):
+    """
+    Return a (requests.Session, username) tuple for the SDC, reusing the most recent
+    successful login unless always_prompt is set
+    """
+    if not always_prompt and _SESSION_CACHE:
+        return _SESSION_CACHE[list(_SESSION_CACHE)[-1]]
+
+    sdc_session, user = mms_login_lasp(always_prompt=always_prompt)
+
+    # mms_login_lasp falls back to public access when the login fails (bad password,
+    # network error); don't keep those sessions, so the next call tries to log in again
+    if user is None and sdc_session.auth is not None:
+        return sdc_session, user
+
+    _evict_session(user)
+    _SESSION_CACHE[user] = (sdc_session, user)
+    return sdc_session, user
+
+
+def _evict_session(user):
+    """
+    Close and forget the cached session for user, e.g., after a failed request
+    """
+    cached = _SESSION_CACHE.pop(user, None)
+    if cached is not None:
+        cached[0].close()
+
+
+def _file_info_cache_path(local_data_dir, url):
+    """
+    Return the path of the on-disk cache for the SDC file_info response at url
+    """
+    return os.path.join(local_data_dir, '.sdc_cache', hashlib.sha1(url.encode()).hexdigest() + '.json')
+
+
+def _read_file_info_cache(cache_file):
+    """
+    Return the cached list of files from cache_file, or None if the cache is missing or stale
+    """
+    try:
+        if time.time() - os.stat(cache_file).st_mtime > FILE_INFO_CACHE_TTL:
+            os.remove(cache_file)
+            return None
+        with open(cache_file, 'rb') as f:
+            return _loads(f.read())['files']
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _prune_file_info_cache(cache_dir):
+    """
+    Remove the cached file_info responses in cache_dir that are older than FILE_INFO_CACHE_TTL
+    """
+    now = time.time()
+    with os.scandir(cache_dir) as entries:
+        for entry in entries:
+            try:
+                if entry.name.endswith('.json') and now - entry.stat().st_mtime > FILE_INFO_CACHE_TTL:
+                    os.remove(entry.path)
+            except OSError:
+                pass
+
+
+def _write_file_info_cache(cache_file, http_json):
+    """
+    Save the SDC file_info response to cache_file, and remove any stale responses
+    cached alongside it; failures are not fatal
+    """
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        _prune_file_info_cache(os.path.dirname(cache_file))
+        with open(cache_file, 'w') as f:
+            json.dump(http_json, f)
+    except OSError as e:
+        logging.warning('Unable to cache the SDC file list: ' + str(e))
+
+
+def _fetch_one(file, out_dir, sdc_session, user):
+    """
+    Download a single ancillary file to out_dir (unless a copy with the same size
+    already exists there), and return the local file name
+    """
+    out_file = os.path.join(out_dir, file['file_name'])
+
+    try:
+        if os.stat(out_file).st_size == int(file['file_size']):
+            return out_file
+    except FileNotFoundError:
+        pass
+
+    access = 'public' if user is None else 'sitl'
+    download_url = f"https://lasp.colorado.edu/mms/sdc/{access}/files/api/v1/download/ancillary?file={file['file_name']}"
+
+    logging.info('Downloading ' + file['file_name'] + ' to ' + out_dir)
+
+    fsrc = sdc_session.get(download_url, stream=True, verify=True)
+
+    # write to a partial file, and only move it into place once the download is complete
+    part_file = out_file + '.part'
+
+    with open(part_file, 'wb') as f:
+        copyfileobj(fsrc.raw, f, length=1024*1024)
+
+    os.replace(part_file, out_file)
+    fsrc.close()
+    return out_file
+
 
 def mms_get_state_data(probe='1', trange=['2015-10-16', '2015-10-17'], 
     datatypes=['pos', 'vel'], level='def', no_download=False, pred_or_def=True, 
-    suffix='', always_prompt=False):
+    suffix='', always_prompt=False, force_refresh=False):
     """
     Helper routine for loading state data (ASCII files from the SDC); not meant to be called directly; see pyspedas.mms.state instead
+
+    The list of files returned by the SDC is cached on disk for FILE_INFO_CACHE_TTL seconds; set
+    force_refresh=True to always query the SDC
     """
 
     if not isinstance(probe, list): probe = [probe]
@@ -49,87 +193,122 @@ def mms_get_state_data(probe='1', trange=['2015-10-16', '2015-10-17'],
     if 'spinras' in datatypes or 'spindec' in datatypes:
         filetypes.append('att')
 
+    # probes will need to be strings from now on
+    probe = [str(probe_id) for probe_id in probe]
+
     user = None
     if not no_download:
-        sdc_session, user = mms_login_lasp(always_prompt=always_prompt)
+        sdc_session, user = _get_or_create_session(always_prompt=always_prompt)
 
-    return_vars = []
+    # files in the trange, keyed by (probe, filetype)
+    files_in_interval = {}
 
-    for probe_id in probe:
-        # probe will need to be a string from now on
-        probe_id = str(probe_id)
+    if CONFIG['no_download'] != True and no_download != True:
+        # predicted doesn't support start_date/end_date
+        if level == 'def':
+            dates_for_query = f'&start_date={start_time_str}&end_date={end_time_str}'
+        else:
+            dates_for_query = ''
+
+        access = 'public' if user is None else 'sitl'
+        # the SDC accepts a comma separated list of spacecraft, so query all of the probes at once
+        sc_ids = ','.join([f'mms{probe_id}' for probe_id in probe])
 
         for filetype in filetypes:
             product = level + filetype
 
-            files_in_interval = []
-            out_files = []
+            url = f'https://lasp.colorado.edu/mms/sdc/{access}/files/api/v1/file_info/ancillary?sc_id={sc_ids}&product={product}{dates_for_query}'
 
-            out_dir = os.sep.join([local_data_dir, 'ancillary', 'mms'+probe_id, level+filetype])
-
-            if CONFIG['no_download'] != True and no_download != True:
-                # predicted doesn't support start_date/end_date
-                if level == 'def':
-                    dates_for_query = '&start_date='+start_time_str+'&end_date='+end_time_str
-                else:
-                    dates_for_query = ''
-
-                if user is None:
-                    url = 'https://lasp.colorado.edu/mms/sdc/public/files/api/v1/file_info/ancillary?sc_id=mms'+probe_id+'&product='+product+dates_for_query
-                else:
-                    url = 'https://lasp.colorado.edu/mms/sdc/sitl/files/api/v1/file_info/ancillary?sc_id=mms'+probe_id+'&product='+product+dates_for_query
+            cache_file = _file_info_cache_path(local_data_dir, url)
+            remote_files = None if force_refresh else _read_file_info_cache(cache_file)
+            http_request = None
 
+            if remote_files is None:
                 with warnings.catch_warnings():
                     warnings.simplefilter("ignore", category=ResourceWarning)
-                    http_request = sdc_session.get(url, verify=True)
-                    http_json = http_request.json()
-
-                # since predicted doesn't support start_date/end_date, we'll need to parse the correct dates
-                if level != 'def':
-                    for file in http_json['files']:
-                        # first, remove the dates that start after the end of the trange
-                        if time_double(file['start_date']) > endtime_day:
-                            continue
-                        # now remove files that end before the start of the trange
-                        if start_time > time_double(file['end_date']):
-                            continue
-                        files_in_interval.append(file)
-                        break
-                else:
-                    files_in_interval = http_json['files']
-
-                for file in files_in_interval:
-                    out_file = os.sep.join([out_dir, file['file_name']])
-
-                    if os.path.exists(out_file) and str(os.stat(out_file).st_size) == str(file['file_size']):
-                        out_files.append(out_file)
-                        http_request.close()
-                        continue
-
-                    if user is None:
-                        download_url = 'https://lasp.colorado.edu/mms/sdc/public/files/api/v1/download/ancillary?file=' + file['file_name']
+                    try:
+                        http_request = sdc_session.get(url, verify=True, stream=True)
+                        http_request.raise_for_status()
+                    except requests.exceptions.RequestException as e:
+                        # e.g., the login is no longer valid (401); log in again on the next call,
+                        # and look for local files this time
+                        logging.error('Error querying the SDC for ' + product + ' files: ' + str(e))
+                        _evict_session(user)
+                        remote_files = []
                     else:
-                        download_url = 'https://lasp.colorado.edu/mms/sdc/sitl/files/api/v1/download/ancillary?file=' + file['file_name']
+                        if level != 'def' and ijson is not None:
+                            # we only need the first matching file, so parse the (potentially
+                            # long) list of predicted files incrementally instead of all at once
+                            http_request.raw.decode_content = True
+                            remote_files = ijson.items(http_request.raw, 'files.item')
+                        else:
+                            http_json = _loads(http_request.content)
+                            remote_files = http_json['files']
+                            _write_file_info_cache(cache_file, http_json)
+
+            for probe_id in probe:
+                files_in_interval[(probe_id, filetype)] = []
+
+            for file in remote_files:
+                # file names are of the form MMS1_DEFEPH_2015289_2015290.V00
+                probe_files = files_in_interval.get((file['file_name'].split('_')[0].lower()[3:], filetype))
+                if probe_files is None:
+                    continue
 
-                    logging.info('Downloading ' + file['file_name'] + ' to ' + out_dir)
-
-                    with warnings.catch_warnings():
-                        warnings.simplefilter("ignore", category=ResourceWarning)
-                        fsrc = sdc_session.get(download_url, stream=True, verify=True)
-
-                    ftmp = NamedTemporaryFile(delete=False)
+                if level == 'def':
+                    probe_files.append(file)
+                    continue
 
-                    with open(ftmp.name, 'wb') as f:
-                        copyfileobj(fsrc.raw, f)
+                # since predicted doesn't support start_date/end_date, we'll need to parse the correct dates
+                if probe_files:
+                    continue
+                # first, remove the dates that start after the end of the trange
+                if time_double(file['start_date']) > endtime_day:
+                    continue
+                # now remove files that end before the start of the trange
+                if start_time > time_double(file['end_date']):
+                    continue
+                probe_files.append(file)
+
+                # stop once we've found a file for each probe
+                if all(files_in_interval[(probe_id, filetype)] for probe_id in probe):
+                    break
+
+            if http_request is not None:
+                http_request.close()
+
+    # (file, output directory, (probe, filetype)) for each file to download
+    downloads = []
+
+    for (probe_id, filetype), probe_files in files_in_interval.items():
+        out_dir = os.path.join(local_data_dir, 'ancillary', f'mms{probe_id}', f'{level}{filetype}')
+        if probe_files:
+            os.makedirs(out_dir, exist_ok=True)
+        downloads += [(file, out_dir, (probe_id, filetype)) for file in probe_files]
+
+    # local files, keyed by (probe, filetype)
+    downloaded_files = {}
+
+    if downloads:
+        # the downloads are network-bound, so fetch the files for all of the probes and filetypes concurrently;
+        # warnings.catch_warnings isn't thread-safe, so the warnings are filtered here instead of in the workers
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=ResourceWarning)
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                out_files = list(executor.map(lambda download: _fetch_one(download[0], download[1], sdc_session, user), downloads))
+
+        for (file, out_dir, key), out_file in zip(downloads, out_files):
+            downloaded_files.setdefault(key, []).append(out_file)
+
+    # sessions from failed logins aren't cached, so they won't be reused
+    if not no_download and _SESSION_CACHE.get(user, (None, None))[0] is not sdc_session:
+        sdc_session.close()
 
-                    if not os.path.exists(out_dir):
-                        os.makedirs(out_dir)
+    return_vars = []
 
-                    # if the download was successful, copy to data directory
-                    copy(ftmp.name, out_file)
-                    out_files.append(out_file)
-                    fsrc.close()
-                    ftmp.close()
+    for probe_id in probe:
+        for filetype in filetypes:
+            out_files = downloaded_files.get((probe_id, filetype), [])
 
             if download_only:
                 continue
@@ -138,12 +317,11 @@ def mms_get_state_data(probe='1', trange=['2015-10-16', '2015-10-17'],
             if not out_files:
                 out_files = mms_get_local_state_files(probe=probe_id, level=level, filetype=filetype, trange=[start_time_str, end_time_str])
 
+            out_files.sort()
+
             if filetype == 'eph':
-                return_vars += mms_load_eph_tplot(sorted(out_files), level=level, probe=probe_id, datatypes=datatypes, suffix=suffix, trange=trange)
+                return_vars += mms_load_eph_tplot(out_files, level=level, probe=probe_id, datatypes=datatypes, suffix=suffix, trange=trange)
             elif filetype == 'att':
-                return_vars += mms_load_att_tplot(sorted(out_files), level=level, probe=probe_id, datatypes=datatypes, suffix=suffix, trange=trange)
-
-    if not no_download:
-        sdc_session.close()
+                return_vars += mms_load_att_tplot(out_files, level=level, probe=probe_id, datatypes=datatypes, suffix=suffix, trange=trange)
 
     return return_vars
@@ -4,7 +4,7 @@ from pyspedas.mms.print_vars import print_vars
 
 @print_vars
 def mms_load_state(trange=['2015-10-16', '2015-10-17'], probe='1', level='def',
-    datatypes=['pos', 'vel'], no_update=False, pred_or_def=True, suffix=''):
+    datatypes=['pos', 'vel'], no_update=False, pred_or_def=True, suffix='', force_refresh=False):
     """
     This function loads the state (ephemeris and attitude) data from the ASCII files 
     into tplot variables
@@ -42,6 +42,11 @@ def mms_load_state(trange=['2015-10-16', '2015-10-17'], probe='1', level='def',
             Load definitive or predicted (if definitive isn't available); defaults to True
             Default: True
 
+        force_refresh: bool
+            Query the SDC for the list of files even if a recent copy of the list
+            is cached locally
+            Default: False
+
     Returns
     --------
         List of tplot variables created.
@@ -55,4 +60,5 @@ def mms_load_state(trange=['2015-10-16', '2015-10-17'], probe='1', level='def',
 
     """
     return mms_get_state_data(trange=trange, probe=probe, level=level, datatypes=datatypes,
-        no_download=no_update, pred_or_def=pred_or_def, suffix=suffix)
+        no_download=no_update, pred_or_def=pred_or_def, suffix=suffix,
+        force_refresh=force_refresh)
@@ -2,6 +2,7 @@ import logging
 import os
 import re
 import shutil
+import numpy as np
 from .mms_config import CONFIG
 from .mms_files_in_interval import mms_files_in_interval
 from dateutil.rrule import rrule, DAILY
@@ -41,7 +42,7 @@ def mms_get_local_files(probe, instrument, data_rate, level, datatype, trange, m
     ---------
         List of file paths.
     """
-    files_out = []
+    files_out = {}
 
     if mirror:
         if CONFIG.get('mirror_data_dir') is not None:
@@ -58,53 +59,68 @@ def mms_get_local_files(probe, instrument, data_rate, level, datatype, trange, m
     #   -assume file names are of the form:
     #      spacecraft_instrument_rate_level[_datatype]_YYYYMMDD[hhmmss]_version.cdf
 
-    file_name = 'mms'+probe+'_'+instrument+'_'+data_rate+'_'+level+r'(_)?.*_([0-9]{8,14})_v(\d+).(\d+).(\d+).cdf'
+    file_name = rf'mms{probe}_{instrument}_{data_rate}_{level}(_)?.*_(\d{{8,14}})_v(\d+)\.(\d+)\.(\d+)\.cdf$'
 
-    days = rrule(DAILY, dtstart=parse(parse(trange[0]).strftime('%Y-%m-%d')), until=parse(trange[1])-timedelta(seconds=1))
+    regex = re.compile(file_name, re.ASCII)
+
+    # cheap check on the file names before trying the regex
+    file_prefix = f'mms{probe}_{instrument}_{data_rate}_{level}'
+
+    trange_start_dt = parse(parse(trange[0]).strftime('%Y-%m-%d'))
+    trange_end_dt = parse(trange[1])-timedelta(seconds=1)
+
+    days = rrule(DAILY, dtstart=trange_start_dt, until=trange_end_dt)
 
     if datatype == '' or datatype is None:
         level_and_dtype = level
     else:
         level_and_dtype = os.sep.join([level, datatype])
 
+    # (file name, full path, time tag, file size) of each file matching the file name pattern
+    candidates = []
+
+    # srvy directories hold a month of files, so several days can map to the same directory
+    scanned_dirs = set()
+
     for date in days:
         if data_rate == 'brst':
             local_dir = os.sep.join([data_dir, 'mms'+probe, instrument, data_rate, level_and_dtype, date.strftime('%Y'), date.strftime('%m'), date.strftime('%d')])
         else:
             local_dir = os.sep.join([data_dir, 'mms'+probe, instrument, data_rate, level_and_dtype, date.strftime('%Y'), date.strftime('%m')])
 
-        if os.name == 'nt':
-            full_path = os.sep.join([re.escape(local_dir)+os.sep, file_name])
-        else:
-            full_path = os.sep.join([re.escape(local_dir), file_name])
-
-        # check for extra /'s in the path
-        if '//' in full_path:
-            full_path = full_path.replace('//', '/')
-
-        regex = re.compile(full_path)
-        for root, dirs, files in os.walk(data_dir):
-            for file in files:
-                this_file = os.sep.join([root, file])
+        # only the directory for this date can contain matching files, so
+        # there's no need to walk the entire local data directory
+        if local_dir in scanned_dirs or not os.path.isdir(local_dir):
+            continue
+        scanned_dirs.add(local_dir)
+
+        with os.scandir(local_dir) as entries:
+            for entry in entries:
+                file = entry.name
+                if not file.startswith(file_prefix) or not file.endswith('.cdf') or not entry.is_file():
+                    continue
+                this_file = os.sep.join([local_dir, file])
                 if CONFIG['debug_mode']: logging.info('Checking ' + this_file)
-                if CONFIG['debug_mode']: logging.info('against: ' + full_path)
-                
-                matches = regex.match(this_file)
+                if CONFIG['debug_mode']: logging.info('against: ' + file_name)
+
+                matches = regex.match(file)
                 if matches:
-                    this_time = parse(matches.groups()[1])
-                    if this_time >= parse(parse(trange[0]).strftime('%Y-%m-%d')) and this_time <= parse(trange[1])-timedelta(seconds=1):
-                        if not any(this_file == f['full_name'] for f in files_out):
-                            files_out.append({'file_name': file, 'timetag': '', 'full_name': this_file, 'file_size': ''})
+                    # the DirEntry caches the stat results from the directory listing
+                    candidates.append((file, this_file, matches.groups()[1], entry.stat().st_size))
 
-    files_in_interval = mms_files_in_interval(files_out, trange)
+    # filter the candidates to the trange in one pass; the time tags are YYYYMMDD[hhmmss]
+    if candidates:
+        time_tags = [c[2].ljust(14, '0') for c in candidates]
+        times = np.array([t[0:4]+'-'+t[4:6]+'-'+t[6:8]+'T'+t[8:10]+':'+t[10:12]+':'+t[12:14] for t in time_tags], dtype='datetime64[s]')
+        in_trange = (times >= np.datetime64(trange_start_dt, 's')) & (times <= np.datetime64(trange_end_dt, 's'))
 
-    local_files = []
+        for (file, this_file, time_tag, file_size), keep in zip(candidates, in_trange):
+            if keep and file not in files_out:
+                files_out[file] = {'file_name': file, 'timetag': time_tag, 'full_name': this_file, 'file_size': file_size}
 
-    file_names = [f['file_name'] for f in files_in_interval]
+    files_in_interval = mms_files_in_interval(list(files_out.values()), trange)
 
-    for file in files_out:
-        if file['file_name'] in file_names:
-            local_files.append(file['full_name'])
+    local_files = [files_out[f['file_name']]['full_name'] for f in files_in_interval]
 
     if mirror:
         mirror_dir = CONFIG['mirror_data_dir']
@@ -1,6 +1,8 @@
 from getpass import getpass
 from scipy.io import readsav
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
 import pickle
 import logging
@@ -49,6 +51,12 @@ def mms_login_lasp(always_prompt=False, headers={}):
 
     session = requests.Session()
 
+    # reuse connections across requests (including concurrent downloads), and
+    # retry requests that fail due to transient server errors
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16,
+                          max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504], raise_on_status=False))
+    session.mount('https://', adapter)
+
     if user != '':
         session.auth = (user, passwd)
 
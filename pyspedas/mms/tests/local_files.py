@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+
+from pyspedas.mms.mms_config import CONFIG
+from pyspedas.mms.mms_get_local_files import mms_get_local_files
+
+
+class LocalFilesTestCases(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.data_dir = self.tmp_dir.name
+        self.saved_data_dir = CONFIG['local_data_dir']
+        CONFIG['local_data_dir'] = self.data_dir
+
+    def tearDown(self):
+        CONFIG['local_data_dir'] = self.saved_data_dir
+        self.tmp_dir.cleanup()
+
+    def make_files(self, path, names):
+        """Create empty files in the directory data_dir/path, and return their full names"""
+        local_dir = os.sep.join([self.data_dir] + path)
+        os.makedirs(local_dir, exist_ok=True)
+        out = []
+        for name in names:
+            out.append(os.sep.join([local_dir, name]))
+            open(out[-1], 'w').close()
+        return out
+
+    def test_srvy(self):
+        srvy_dir = ['mms1', 'fgm', 'srvy', 'l2', '2015', '10']
+        before, day1, day2, after = self.make_files(srvy_dir, ['mms1_fgm_srvy_l2_20151015_v4.18.0.cdf',
+                                                                'mms1_fgm_srvy_l2_20151016_v4.18.0.cdf',
+                                                                'mms1_fgm_srvy_l2_20151017_v4.18.0.cdf',
+                                                                'mms1_fgm_srvy_l2_20151018_v4.18.0.cdf'])
+        # not CDF files
+        self.make_files(srvy_dir, ['mms1_fgm_srvy_l2_20151016_v4.18.0.cdf.md5'])
+        os.makedirs(os.sep.join([self.data_dir] + srvy_dir + ['mms1_fgm_srvy_l2_20151017_v4.18.1.cdf']))
+        # both days are in the same month directory; each file should only be returned once
+        files = mms_get_local_files('1', 'fgm', 'srvy', 'l2', '', ['2015-10-16', '2015-10-18'])
+        self.assertEqual(files, [day1, day2])
+
+    def test_brst(self):
+        brst_dir = ['mms1', 'fgm', 'brst', 'l2', '2015', '10', '16']
+        early, before, inside, after = self.make_files(brst_dir, ['mms1_fgm_brst_l2_20151016125954_v4.18.0.cdf',
+                                                                   'mms1_fgm_brst_l2_20151016130524_v4.18.0.cdf',
+                                                                   'mms1_fgm_brst_l2_20151016130634_v4.18.0.cdf',
+                                                                   'mms1_fgm_brst_l2_20151016130714_v4.18.0.cdf'])
+        # not in the directory for the trange
+        self.make_files(['mms1', 'fgm', 'brst', 'l2', '2015', '10', '17'], ['mms1_fgm_brst_l2_20151017130634_v4.18.0.cdf'])
+        files = mms_get_local_files('1', 'fgm', 'brst', 'l2', '', ['2015-10-16/13:06', '2015-10-16/13:07'])
+        # the file that starts before the trange is included, since it can contain data in the trange
+        self.assertEqual(files, [before, inside])
+
+    def test_datatype(self):
+        fpi_dir = ['mms1', 'fpi', 'fast', 'l2', 'des-moms', '2015', '10']
+        inside, = self.make_files(fpi_dir, ['mms1_fpi_fast_l2_des-moms_20151016000000_v3.3.0.cdf'])
+        # different probe
+        self.make_files(fpi_dir, ['mms2_fpi_fast_l2_des-moms_20151016000000_v3.3.0.cdf'])
+        files = mms_get_local_files('1', 'fpi', 'fast', 'l2', 'des-moms', ['2015-10-16', '2015-10-17'])
+        self.assertEqual(files, [inside])
+
+    def test_no_files(self):
+        files = mms_get_local_files('1', 'fgm', 'srvy', 'l2', '', ['2015-10-16', '2015-10-17'])
+        self.assertEqual(files, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import io
+import os
+import json
+import time
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from pyspedas.mms.mms_config import CONFIG
+from pyspedas.mms.mec_ascii import mms_get_state_data as state_data
+
+FILES = [{'file_name': 'MMS1_DEFEPH_2015289_2015290.V00', 'file_size': 4,
+          'start_date': '2015-10-16', 'end_date': '2015-10-17'}]
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+        self.raw = io.BytesIO(content)
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    """Stands in for the SDC session; records the file_info queries"""
+    def __init__(self):
+        self.file_info_requests = 0
+
+    def get(self, url, **kwargs):
+        if 'file_info' in url:
+            self.file_info_requests += 1
+            return FakeResponse(json.dumps({'files': FILES}).encode())
+        return FakeResponse(b'data')
+
+    def close(self):
+        pass
+
+
+class StateFileCacheTestCases(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.saved_data_dir = CONFIG['local_data_dir']
+        CONFIG['local_data_dir'] = self.tmp_dir.name
+        self.cache_dir = os.path.join(self.tmp_dir.name, '.sdc_cache')
+        self.session = FakeSession()
+        patches = [patch.object(state_data, '_get_or_create_session', return_value=(self.session, None)),
+                   patch.object(state_data, 'mms_load_eph_tplot', side_effect=lambda files, **kwargs: files)]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def tearDown(self):
+        CONFIG['local_data_dir'] = self.saved_data_dir
+        self.tmp_dir.cleanup()
+
+    def load(self, **kwargs):
+        return state_data.mms_get_state_data(probe='1', trange=['2015-10-16', '2015-10-17'], datatypes=['pos'], **kwargs)
+
+    def test_cache_hit(self):
+        files = self.load()
+        self.assertEqual(self.session.file_info_requests, 1)
+        self.assertEqual([os.path.basename(f) for f in files], ['MMS1_DEFEPH_2015289_2015290.V00'])
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+        # the second call should use the cached list of files
+        self.assertEqual(self.load(), files)
+        self.assertEqual(self.session.file_info_requests, 1)
+
+    def test_force_refresh(self):
+        files = self.load()
+        self.assertEqual(self.load(force_refresh=True), files)
+        self.assertEqual(self.session.file_info_requests, 2)
+
+    def test_stale_cache(self):
+        self.load()
+        # an unrelated stale entry, e.g., from a different trange
+        other = os.path.join(self.cache_dir, 'other.json')
+        with open(other, 'w') as f:
+            json.dump({'files': []}, f)
+        stale = time.time() - state_data.FILE_INFO_CACHE_TTL - 60
+        for name in os.listdir(self.cache_dir):
+            os.utime(os.path.join(self.cache_dir, name), (stale, stale))
+        self.load()
+        self.assertEqual(self.session.file_info_requests, 2)
+        # the stale entries are removed, and the new response is cached
+        self.assertFalse(os.path.exists(other))
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+        for name in os.listdir(self.cache_dir):
+            self.assertTrue(os.stat(os.path.join(self.cache_dir, name)).st_mtime > stale)
+
+
+if __name__ == '__main__':
+    unittest.main()